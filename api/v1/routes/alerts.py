@@ -108,20 +108,17 @@ async def send_alert(
             channels=alert.channels,
         )
 
-        # Send through selected channels
+        # Send through selected channels (in parallel, off the event loop)
         sent_channels = []
-        for channel in alert.channels:
-            try:
-                result = alert_router.send_multi_channel_alert(
-                    title=alert.title,
-                    message=alert.message,
-                    severity=alert.severity,
-                    channels=[channel],
-                )
-                if result:
-                    sent_channels.append(channel)
-            except Exception as e:
-                app_logger.error(f"{channel}_alert_failed", error=str(e))
+        try:
+            results = await alert_router.send_multi_channel_alert_async(
+                message=alert.message,
+                severity=alert.severity,
+                channels=alert.channels,
+            )
+            sent_channels = [channel for channel, ok in results.items() if ok]
+        except Exception as e:
+            app_logger.error("alert_channels_failed", error=str(e))
 
         # Generate alert ID
         alert_id = f"alert_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
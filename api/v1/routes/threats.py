@@ -148,7 +148,7 @@ async def detect_threat(
             # Convert to RGB if necessary (handles PNG with alpha, etc.)
             if image.mode != "RGB":
                 image = image.convert("RGB")
-            image_array = np.array(image)
+            image_array = np.asarray(image)
         except Exception as img_error:
             app_logger.error(
                 "image_processing_error",
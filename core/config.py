@@ -4,31 +4,54 @@ Handles encrypted API keys and application settings
 """
 
 import os
+import threading
 from typing import Optional, List
 from pydantic import BaseModel, Field, validator
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from cryptography.fernet import Fernet
 from dotenv import load_dotenv
 import json
+from functools import lru_cache
 
 load_dotenv()
 
 
+_KEY_FILE = ".encryption_key"
+_KEY_LOCK = threading.Lock()
+_KEY_CACHE: Optional[bytes] = None
+_CIPHER_CACHE: Optional[Fernet] = None
+
+
 class EncryptionService:
     """Service for encrypting and decrypting sensitive data"""
 
+    _instance: Optional["EncryptionService"] = None
+
     def __init__(self):
-        # Generate or load encryption key
-        key_file = ".encryption_key"
-        if os.path.exists(key_file):
-            with open(key_file, "rb") as f:
-                self.key = f.read()
-        else:
-            self.key = Fernet.generate_key()
-            with open(key_file, "wb") as f:
-                f.write(self.key)
-
-        self.cipher = Fernet(self.key)
+        global _KEY_CACHE, _CIPHER_CACHE
+
+        # Generate or load encryption key once per process
+        with _KEY_LOCK:
+            if _CIPHER_CACHE is None:
+                if os.path.exists(_KEY_FILE):
+                    with open(_KEY_FILE, "rb") as f:
+                        _KEY_CACHE = f.read()
+                else:
+                    _KEY_CACHE = Fernet.generate_key()
+                    with open(_KEY_FILE, "wb") as f:
+                        f.write(_KEY_CACHE)
+
+                _CIPHER_CACHE = Fernet(_KEY_CACHE)
+
+        self.key = _KEY_CACHE
+        self.cipher = _CIPHER_CACHE
+
+    @classmethod
+    def instance(cls) -> "EncryptionService":
+        """Get the shared encryption service"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
 
     def encrypt(self, data: str) -> str:
         """Encrypt sensitive data"""
@@ -171,44 +194,73 @@ class AppSettings(BaseSettings):
     cost_tracking: CostTrackingConfig = CostTrackingConfig()
     rag: RAGConfig = RAGConfig()
 
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
+    model_config = SettingsConfigDict(
+        env_file=".env", env_file_encoding="utf-8", case_sensitive=False
+    )
 
 
+@lru_cache(maxsize=1)
 def load_settings() -> AppSettings:
-    """Load application settings with encrypted API keys"""
-    encryption_service = EncryptionService()
-
+    """Load application settings with encrypted API keys (built once per process)"""
     # Load base settings
     settings = AppSettings()
 
+    # Snapshot the environment once instead of querying it per key
+    env = dict(os.environ)
+
     # Load and decrypt API keys
-    if os.getenv("OPENAI_API_KEY"):
-        settings.ai_model.openai_api_key = os.getenv("OPENAI_API_KEY")
+    if env.get("OPENAI_API_KEY"):
+        settings.ai_model.openai_api_key = env.get("OPENAI_API_KEY")
 
-    if os.getenv("GOOGLE_API_KEY"):
-        settings.ai_model.google_api_key = os.getenv("GOOGLE_API_KEY")
+    if env.get("GOOGLE_API_KEY"):
+        settings.ai_model.google_api_key = env.get("GOOGLE_API_KEY")
 
-    if os.getenv("ANTHROPIC_API_KEY"):
-        settings.ai_model.anthropic_api_key = os.getenv("ANTHROPIC_API_KEY")
+    if env.get("ANTHROPIC_API_KEY"):
+        settings.ai_model.anthropic_api_key = env.get("ANTHROPIC_API_KEY")
 
     # Load integration keys
-    settings.integrations.twilio_account_sid = os.getenv("TWILIO_ACCOUNT_SID")
-    settings.integrations.twilio_auth_token = os.getenv("TWILIO_AUTH_TOKEN")
-    settings.integrations.twilio_phone_number = os.getenv("TWILIO_PHONE_NUMBER")
-    settings.integrations.slack_webhook_url = os.getenv("SLACK_WEBHOOK_URL")
-    settings.integrations.discord_webhook_url = os.getenv("DISCORD_WEBHOOK_URL")
+    settings.integrations.twilio_account_sid = env.get("TWILIO_ACCOUNT_SID")
+    settings.integrations.twilio_auth_token = env.get("TWILIO_AUTH_TOKEN")
+    settings.integrations.twilio_phone_number = env.get("TWILIO_PHONE_NUMBER")
+    settings.integrations.slack_webhook_url = env.get("SLACK_WEBHOOK_URL")
+    settings.integrations.discord_webhook_url = env.get("DISCORD_WEBHOOK_URL")
 
     # Load database config
-    settings.database.host = os.getenv("MYSQL_HOST", "localhost")
-    settings.database.user = os.getenv("MYSQL_USER", "root")
-    settings.database.password = os.getenv("MYSQL_PASSWORD", "")
-    settings.database.database = os.getenv("MYSQL_DATABASE", "can2025")
+    settings.database.host = env.get("MYSQL_HOST", "localhost")
+    settings.database.user = env.get("MYSQL_USER", "root")
+    settings.database.password = env.get("MYSQL_PASSWORD", "")
+    settings.database.database = env.get("MYSQL_DATABASE", "can2025")
 
     return settings
 
 
+class _LazySettings:
+    """
+    Proxy that builds AppSettings on first attribute access
+    Keeps `from core.config import settings` cheap for modules that never read it
+    """
+
+    def __init__(self):
+        object.__setattr__(self, "_obj", None)
+
+    def _load(self) -> AppSettings:
+        obj = object.__getattribute__(self, "_obj")
+        if obj is None:
+            obj = load_settings()
+            object.__setattr__(self, "_obj", obj)
+        return obj
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._load(), name, value)
+
+    def __repr__(self) -> str:
+        return repr(self._load())
+
+
 # Global settings instance
-settings = load_settings()
+settings = _LazySettings()
+
+__all__ = ["EncryptionService", "AppSettings", "load_settings", "settings"]
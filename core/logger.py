@@ -3,18 +3,38 @@ Comprehensive Logging Framework
 Handles application logs and audit trails
 """
 
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 import structlog
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any
-import json
+import orjson
 
 # Create logs directory
 LOG_DIR = Path("logs")
 LOG_DIR.mkdir(exist_ok=True)
 
 
+def _dumps(entry: Dict[str, Any]) -> str:
+    """Serialize a log entry to a JSON line (datetimes rendered by orjson)"""
+    return orjson.dumps(entry, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _daily_file_handler(filename: str) -> TimedRotatingFileHandler:
+    """File handler that rolls over at UTC midnight and opens lazily on first write"""
+    return TimedRotatingFileHandler(
+        LOG_DIR / filename,
+        when="midnight",
+        utc=True,
+        backupCount=30,
+        encoding="utf-8",
+        delay=True,
+    )
+
+
 def setup_logging(log_level: str = "INFO") -> structlog.BoundLogger:
     """
     Setup structured logging with both file and console output
@@ -31,9 +51,7 @@ def setup_logging(log_level: str = "INFO") -> structlog.BoundLogger:
         format="%(message)s",
         level=getattr(logging, log_level),
         handlers=[
-            logging.FileHandler(
-                LOG_DIR / f"app_{datetime.now().strftime('%Y%m%d')}.log"
-            ),
+            _daily_file_handler("app.log"),
             logging.StreamHandler(),
         ],
     )
@@ -59,6 +77,23 @@ def setup_logging(log_level: str = "INFO") -> structlog.BoundLogger:
     return structlog.get_logger()
 
 
+def _attach_queue_listener(
+    logger: logging.Logger, handler: logging.Handler
+) -> QueueListener:
+    """
+    Route a logger's records through a queue drained by a background thread
+
+    The calling thread only enqueues; the file write happens on the listener.
+    """
+    log_queue: queue.Queue = queue.Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
+
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
 class AuditLogger:
     """
     Audit logger for tracking user actions and system events
@@ -66,13 +101,13 @@ class AuditLogger:
     """
 
     def __init__(self):
-        self.audit_file = LOG_DIR / f"audit_{datetime.now().strftime('%Y%m%d')}.log"
+        self.audit_file = LOG_DIR / "audit.log"
         self.logger = logging.getLogger("audit")
 
-        # Separate handler for audit logs
-        handler = logging.FileHandler(self.audit_file)
+        # Separate handler for audit logs, written off the request thread
+        handler = _daily_file_handler(self.audit_file.name)
         handler.setFormatter(logging.Formatter("%(message)s"))
-        self.logger.addHandler(handler)
+        self.listener = _attach_queue_listener(self.logger, handler)
         self.logger.setLevel(logging.INFO)
 
     def log_event(
@@ -98,7 +133,7 @@ class AuditLogger:
             ip_address: Client IP address
         """
         audit_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.utcnow(),
             "event_type": event_type,
             "user_id": user_id,
             "action": action,
@@ -108,7 +143,7 @@ class AuditLogger:
             "details": details or {},
         }
 
-        self.logger.info(json.dumps(audit_entry))
+        self.logger.info(_dumps(audit_entry))
 
     def log_threat_detection(
         self,
@@ -229,14 +264,12 @@ class PerformanceLogger:
     """Logger for tracking performance metrics"""
 
     def __init__(self):
-        self.perf_file = (
-            LOG_DIR / f"performance_{datetime.now().strftime('%Y%m%d')}.log"
-        )
+        self.perf_file = LOG_DIR / "performance.log"
         self.logger = logging.getLogger("performance")
 
-        handler = logging.FileHandler(self.perf_file)
+        handler = _daily_file_handler(self.perf_file.name)
         handler.setFormatter(logging.Formatter("%(message)s"))
-        self.logger.addHandler(handler)
+        self.listener = _attach_queue_listener(self.logger, handler)
         self.logger.setLevel(logging.INFO)
 
     def log_metric(
@@ -248,14 +281,14 @@ class PerformanceLogger:
     ):
         """Log a performance metric"""
         metric_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.utcnow(),
             "metric": metric_name,
             "value": value,
             "unit": unit,
             "context": context or {},
         }
 
-        self.logger.info(json.dumps(metric_entry))
+        self.logger.info(_dumps(metric_entry))
 
 
 # Global logger instances
@@ -3,20 +3,34 @@ Rate Limiting Middleware
 Prevents API abuse and manages request quotas
 """
 
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
-from collections import defaultdict
+from dataclasses import dataclass
+import threading
 import time
 from functools import wraps
 from core.logger import app_logger, audit_logger
 
 
+@dataclass(slots=True)
+class _TokenBuckets:
+    """Per-user token counts for each window, refilled lazily on access"""
+
+    minute: float
+    hour: float
+    day: float
+    last_refill: float
+
+
 class RateLimiter:
     """
     Token bucket rate limiter for API calls
     Supports per-minute, per-hour, and per-day limits
     """
 
+    # Must be a power of two (shard index is hash & (NUM_SHARDS - 1))
+    NUM_SHARDS = 16
+
     def __init__(
         self,
         max_per_minute: int = 60,
@@ -27,10 +41,16 @@ class RateLimiter:
         self.max_per_hour = max_per_hour
         self.max_per_day = max_per_day
 
-        # Request counters
-        self.minute_requests: Dict[str, list] = defaultdict(list)
-        self.hour_requests: Dict[str, list] = defaultdict(list)
-        self.day_requests: Dict[str, list] = defaultdict(list)
+        # Refill rates in tokens per second
+        self._minute_rate = max_per_minute / 60
+        self._hour_rate = max_per_hour / 3600
+        self._day_rate = max_per_day / 86400
+
+        # Buckets per user, spread over shards so concurrent checks for
+        # different users rarely wait on the same lock.
+        self._shards: List[Tuple[Dict[str, _TokenBuckets], threading.Lock]] = [
+            ({}, threading.Lock()) for _ in range(self.NUM_SHARDS)
+        ]
 
         app_logger.info(
             "rate_limiter_initialized",
@@ -41,10 +61,31 @@ class RateLimiter:
             },
         )
 
-    def _clean_old_requests(self, requests: list, window_seconds: int):
-        """Remove requests older than the time window"""
-        cutoff = time.time() - window_seconds
-        return [req for req in requests if req > cutoff]
+    def _shard(self, user_id: str) -> Tuple[Dict[str, _TokenBuckets], threading.Lock]:
+        """Get the (buckets, lock) shard that owns a user"""
+        return self._shards[hash(user_id) & (self.NUM_SHARDS - 1)]
+
+    def _refill(self, buckets: Dict[str, _TokenBuckets], user_id: str) -> _TokenBuckets:
+        """Get a user's buckets topped up for the time elapsed since last refill"""
+        now = time.monotonic()
+        bucket = buckets.get(user_id)
+        if bucket is None:
+            bucket = buckets[user_id] = _TokenBuckets(
+                float(self.max_per_minute),
+                float(self.max_per_hour),
+                float(self.max_per_day),
+                now,
+            )
+            return bucket
+
+        elapsed = now - bucket.last_refill
+        bucket.minute = min(
+            self.max_per_minute, bucket.minute + elapsed * self._minute_rate
+        )
+        bucket.hour = min(self.max_per_hour, bucket.hour + elapsed * self._hour_rate)
+        bucket.day = min(self.max_per_day, bucket.day + elapsed * self._day_rate)
+        bucket.last_refill = now
+        return bucket
 
     def check_limit(self, user_id: str) -> tuple[bool, Optional[str]]:
         """
@@ -56,75 +97,62 @@ class RateLimiter:
         Returns:
             (is_allowed, error_message)
         """
-        current_time = time.time()
-
-        # Clean old requests
-        self.minute_requests[user_id] = self._clean_old_requests(
-            self.minute_requests[user_id], 60
-        )
-        self.hour_requests[user_id] = self._clean_old_requests(
-            self.hour_requests[user_id], 3600
-        )
-        self.day_requests[user_id] = self._clean_old_requests(
-            self.day_requests[user_id], 86400
-        )
-
-        # Check per-minute limit
-        if len(self.minute_requests[user_id]) >= self.max_per_minute:
-            audit_logger.log_event(
-                event_type="rate_limit_exceeded",
-                user_id=user_id,
-                action="api_call",
-                resource="per_minute_limit",
-                status="blocked",
-            )
-            return (
-                False,
-                f"Rate limit exceeded: {self.max_per_minute} requests per minute",
-            )
+        buckets, lock = self._shard(user_id)
+        blocked = None
 
-        # Check per-hour limit
-        if len(self.hour_requests[user_id]) >= self.max_per_hour:
-            audit_logger.log_event(
-                event_type="rate_limit_exceeded",
-                user_id=user_id,
-                action="api_call",
-                resource="per_hour_limit",
-                status="blocked",
-            )
-            return False, f"Rate limit exceeded: {self.max_per_hour} requests per hour"
+        with lock:
+            bucket = self._refill(buckets, user_id)
 
-        # Check per-day limit
-        if len(self.day_requests[user_id]) >= self.max_per_day:
+            if bucket.minute < 1:
+                blocked = (
+                    "per_minute_limit",
+                    f"Rate limit exceeded: {self.max_per_minute} requests per minute",
+                )
+            elif bucket.hour < 1:
+                blocked = (
+                    "per_hour_limit",
+                    f"Rate limit exceeded: {self.max_per_hour} requests per hour",
+                )
+            elif bucket.day < 1:
+                blocked = (
+                    "per_day_limit",
+                    f"Rate limit exceeded: {self.max_per_day} requests per day",
+                )
+            else:
+                # Spend one token from every window
+                bucket.minute -= 1
+                bucket.hour -= 1
+                bucket.day -= 1
+
+        if blocked is not None:
+            resource, error_msg = blocked
             audit_logger.log_event(
                 event_type="rate_limit_exceeded",
                 user_id=user_id,
                 action="api_call",
-                resource="per_day_limit",
+                resource=resource,
                 status="blocked",
             )
-            return False, f"Rate limit exceeded: {self.max_per_day} requests per day"
-
-        # Record this request
-        self.minute_requests[user_id].append(current_time)
-        self.hour_requests[user_id].append(current_time)
-        self.day_requests[user_id].append(current_time)
+            return False, error_msg
 
         return True, None
 
     def get_remaining_quota(self, user_id: str) -> Dict[str, int]:
         """Get remaining request quota for user"""
-        return {
-            "per_minute": self.max_per_minute - len(self.minute_requests[user_id]),
-            "per_hour": self.max_per_hour - len(self.hour_requests[user_id]),
-            "per_day": self.max_per_day - len(self.day_requests[user_id]),
-        }
+        buckets, lock = self._shard(user_id)
+        with lock:
+            bucket = self._refill(buckets, user_id)
+            return {
+                "per_minute": int(bucket.minute),
+                "per_hour": int(bucket.hour),
+                "per_day": int(bucket.day),
+            }
 
     def reset_user_limits(self, user_id: str):
         """Reset all limits for a user (admin function)"""
-        self.minute_requests[user_id] = []
-        self.hour_requests[user_id] = []
-        self.day_requests[user_id] = []
+        buckets, lock = self._shard(user_id)
+        with lock:
+            buckets.pop(user_id, None)
 
         app_logger.info("rate_limits_reset", user_id=user_id)
 
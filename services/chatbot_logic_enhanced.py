@@ -5,7 +5,7 @@ Features: Streaming, RAG, Caching, Conversation Memory
 """
 
 import os
-from typing import List, Dict, Optional, Iterator
+from typing import List, Optional, Iterator
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -15,9 +15,13 @@ from langchain.memory import ConversationBufferWindowMemory
 from langchain_chroma import Chroma
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.chains import ConversationalRetrievalChain
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain.storage import LocalFileStore
 import diskcache as dc
 import hashlib
+import threading
 import time
+from collections import OrderedDict
 
 from core.config import settings
 from core.logger import app_logger, audit_logger, perf_logger
@@ -26,8 +30,32 @@ from core.rate_limiter import global_rate_limiter, RateLimitError
 # Load environment variables
 load_dotenv()
 
-# Initialize cache
-cache = dc.Cache("./cache")
+# Initialize cache (sharded across several SQLite files to reduce write contention)
+cache = dc.FanoutCache("./cache", shards=8, timeout=1, size_limit=2**30)
+
+# System prompt shared by every request (messages are never mutated, so one
+# instance is reused)
+_SYSTEM_PROMPT = """
+You are 'Guardian AI', a specialized Security Expert and Tourist Guide for the CAN 2025 (Africa Cup of Nations) in Morocco.
+
+Your Mission:
+1. Assist fans with information regarding stadium logistics, local tourism, and tournament schedules.
+2. Provide expert security advice and monitoring insights.
+
+Languages:
+- You MUST respond in the language used by the user: Moroccan Darija, English, French, or Arabic.
+- If the user uses a mix (e.g., Darija/French), respond appropriately.
+
+Safety & Security Protocol:
+- If the user asks about weapons, violence, or how to bypass security, you MUST immediately stop any casual tone and provide strict security protocols.
+- State clearly that weapons are strictly prohibited in all CAN 2025 venues and that any suspicious behavior will be reported to the Royal Moroccan Gendarmerie or local police.
+- Be firm, professional, and prioritize public safety above all else.
+
+Style:
+- Professional, helpful, and welcoming.
+- Use your knowledge of Morocco's hospitality and CAN 2025 venues (e.g., Casablanca, Rabat, Tangier, Marrakech, Agadir, Fez).
+"""
+_SYSTEM_MESSAGE = SystemMessage(content=_SYSTEM_PROMPT)
 
 
 class AIModelManager:
@@ -35,6 +63,7 @@ class AIModelManager:
 
     def __init__(self):
         self.models = {}
+        self._models_lock = threading.Lock()
         self.embeddings = None
         self.vector_store = None
 
@@ -45,8 +74,18 @@ class AIModelManager:
     def _initialize_rag(self):
         """Initialize Retrieval-Augmented Generation"""
         try:
-            self.embeddings = OpenAIEmbeddings(
-                openai_api_key=settings.ai_model.openai_api_key
+            # Embedding vectors are cached on disk keyed by text hash, for
+            # documents and queries alike, so repeated texts skip the remote call
+            embedding_model = settings.rag.embedding_model
+            self.embeddings = CacheBackedEmbeddings.from_bytes_store(
+                OpenAIEmbeddings(
+                    model=embedding_model,
+                    openai_api_key=settings.ai_model.openai_api_key,
+                    chunk_size=1000,
+                ),
+                LocalFileStore("./cache/embeddings"),
+                namespace=embedding_model,
+                query_embedding_cache=True,
             )
 
             # Load stadium knowledge base
@@ -65,22 +104,33 @@ class AIModelManager:
             app_logger.error("rag_initialization_failed", error=str(e))
 
     def get_model(self, model_choice: str = "openai"):
-        """Get AI model instance with error handling"""
-        try:
-            if model_choice == "openai":
-                return self._get_openai_model()
-            elif model_choice == "gemini":
-                return self._get_gemini_model()
-            elif model_choice == "claude":
-                return self._get_claude_model()
-            else:
-                raise ValueError(f"Unsupported model: {model_choice}")
+        """Get AI model instance with error handling (built once, then reused)"""
+        model = self.models.get(model_choice)
+        if model is not None:
+            return model
+
+        with self._models_lock:
+            if model_choice in self.models:
+                return self.models[model_choice]
+
+            try:
+                if model_choice == "openai":
+                    model = self._get_openai_model()
+                elif model_choice == "gemini":
+                    model = self._get_gemini_model()
+                elif model_choice == "claude":
+                    model = self._get_claude_model()
+                else:
+                    raise ValueError(f"Unsupported model: {model_choice}")
+
+            except Exception as e:
+                app_logger.error(
+                    "model_initialization_failed", model=model_choice, error=str(e)
+                )
+                raise
 
-        except Exception as e:
-            app_logger.error(
-                "model_initialization_failed", model=model_choice, error=str(e)
-            )
-            raise
+            self.models[model_choice] = model
+            return model
 
     def _get_openai_model(self) -> ChatOpenAI:
         """Initialize OpenAI GPT model"""
@@ -148,22 +198,31 @@ class ConversationManager:
         self.memory.clear()
 
 
+# Maximum number of chat sessions kept in memory (least recently used evicted)
+MAX_SESSIONS = 10_000
+
 # Global instances
 model_manager = AIModelManager()
-conversation_managers: Dict[str, ConversationManager] = {}
+conversation_managers: "OrderedDict[str, ConversationManager]" = OrderedDict()
+_conversation_lock = threading.Lock()
 
 
 def get_conversation_manager(session_id: str = "default") -> ConversationManager:
     """Get or create conversation manager for session"""
-    if session_id not in conversation_managers:
-        conversation_managers[session_id] = ConversationManager()
-    return conversation_managers[session_id]
+    with _conversation_lock:
+        if session_id in conversation_managers:
+            conversation_managers.move_to_end(session_id)
+        else:
+            conversation_managers[session_id] = ConversationManager()
+            if len(conversation_managers) > MAX_SESSIONS:
+                conversation_managers.popitem(last=False)
+        return conversation_managers[session_id]
 
 
 def _generate_cache_key(user_input: str, model_choice: str) -> str:
     """Generate cache key for request"""
-    content = f"{user_input}:{model_choice}"
-    return hashlib.md5(content.encode()).hexdigest()
+    content = b":".join((user_input.encode("utf-8"), model_choice.encode("utf-8")))
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
 
 
 def _get_cached_response(cache_key: str) -> Optional[str]:
@@ -188,7 +247,7 @@ def _set_cached_response(cache_key: str, response: str):
         return
 
     try:
-        cache.set(cache_key, response, expire=settings.ai_model.cache_ttl)
+        cache.set(cache_key, response, expire=settings.ai_model.cache_ttl, tag="ai")
         app_logger.info("cache_set", cache_key=cache_key)
     except Exception as e:
         app_logger.warning("cache_set_failed", error=str(e))
@@ -196,7 +255,7 @@ def _set_cached_response(cache_key: str, response: str):
 
 def get_response(
     user_input: str,
-    chat_history: List[BaseMessage] = [],
+    chat_history: Optional[List[BaseMessage]] = None,
     model_choice: str = "openai",
     user_id: str = "default",
     stream: bool = False,
@@ -214,9 +273,15 @@ def get_response(
     Returns:
         AI response text
     """
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
 
     try:
+        # Check cache first: hits are served without touching the rate limiter
+        cache_key = _generate_cache_key(user_input, model_choice)
+        cached_response = _get_cached_response(cache_key)
+        if cached_response:
+            return cached_response
+
         # Rate limiting
         if settings.rate_limit.enabled:
             allowed, error_msg = global_rate_limiter.check_limit(user_id)
@@ -229,41 +294,15 @@ def get_response(
                 )
                 return f"⚠️ {error_msg}"
 
-        # Check cache
-        cache_key = _generate_cache_key(user_input, model_choice)
-        cached_response = _get_cached_response(cache_key)
-        if cached_response:
-            return cached_response
-
         # Get AI model
         llm = model_manager.get_model(model_choice)
 
-        # System prompt
-        system_prompt = """
-        You are 'Guardian AI', a specialized Security Expert and Tourist Guide for the CAN 2025 (Africa Cup of Nations) in Morocco.
-
-        Your Mission:
-        1. Assist fans with information regarding stadium logistics, local tourism, and tournament schedules.
-        2. Provide expert security advice and monitoring insights.
-
-        Languages:
-        - You MUST respond in the language used by the user: Moroccan Darija, English, French, or Arabic.
-        - If the user uses a mix (e.g., Darija/French), respond appropriately.
-
-        Safety & Security Protocol:
-        - If the user asks about weapons, violence, or how to bypass security, you MUST immediately stop any casual tone and provide strict security protocols.
-        - State clearly that weapons are strictly prohibited in all CAN 2025 venues and that any suspicious behavior will be reported to the Royal Moroccan Gendarmerie or local police.
-        - Be firm, professional, and prioritize public safety above all else.
-
-        Style:
-        - Professional, helpful, and welcoming.
-        - Use your knowledge of Morocco's hospitality and CAN 2025 venues (e.g., Casablanca, Rabat, Tangier, Marrakech, Agadir, Fez).
-        """
-
         # Build messages
-        messages = [SystemMessage(content=system_prompt)]
-        messages.extend(chat_history)
-        messages.append(HumanMessage(content=user_input))
+        messages = [
+            _SYSTEM_MESSAGE,
+            *(chat_history or ()),
+            HumanMessage(content=user_input),
+        ]
 
         # Get response
         response = llm.invoke(messages)
@@ -273,7 +312,7 @@ def get_response(
         _set_cached_response(cache_key, response_text)
 
         # Log metrics
-        response_time = (time.time() - start_time) * 1000
+        response_time = (time.perf_counter_ns() - start_ns) / 1e6
         perf_logger.log_metric(
             "ai_response_time",
             response_time,
@@ -306,7 +345,7 @@ def get_response(
 
 def get_streaming_response(
     user_input: str,
-    chat_history: List[BaseMessage] = [],
+    chat_history: Optional[List[BaseMessage]] = None,
     model_choice: str = "openai",
     user_id: str = "default",
 ) -> Iterator[str]:
@@ -327,11 +366,12 @@ def get_streaming_response(
         # Get AI model with streaming enabled
         llm = model_manager.get_model(model_choice)
 
-        # System prompt and messages (same as above)
-        system_prompt = """..."""  # Same as get_response
-        messages = [SystemMessage(content=system_prompt)]
-        messages.extend(chat_history)
-        messages.append(HumanMessage(content=user_input))
+        # Build messages
+        messages = [
+            _SYSTEM_MESSAGE,
+            *(chat_history or ()),
+            HumanMessage(content=user_input),
+        ]
 
         # Stream response
         for chunk in llm.stream(messages):
@@ -4,9 +4,14 @@ Monitors spending across AI providers and optimizes usage
 """
 
 from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from collections import defaultdict
+from datetime import date, datetime, timedelta
 from dataclasses import dataclass, asdict
+import atexit
 import json
+import queue
+import threading
+import numpy as np
 from pathlib import Path
 
 from core.config import settings
@@ -27,48 +32,233 @@ class APICall:
     user_id: str
 
 
+class _CallColumns:
+    """
+    Columnar copy of the call history for vectorized aggregation
+    Buffers grow by doubling; providers and users are stored as integer codes
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        self.timestamp = np.empty(capacity, dtype="datetime64[us]")
+        self.cost = np.empty(capacity, dtype=np.float64)
+        self.tokens = np.empty(capacity, dtype=np.int64)
+        self.response_time = np.empty(capacity, dtype=np.float64)
+        self.provider = np.empty(capacity, dtype=np.int32)
+        self.user = np.empty(capacity, dtype=np.int32)
+
+        self.provider_labels: List[str] = []
+        self.user_labels: List[str] = []
+        self._provider_codes: Dict[str, int] = {}
+        self._user_codes: Dict[str, int] = {}
+
+    @staticmethod
+    def _code(label: str, codes: Dict[str, int], labels: List[str]) -> int:
+        """Get the integer code for a label, assigning a new one if unseen"""
+        code = codes.get(label)
+        if code is None:
+            code = codes[label] = len(labels)
+            labels.append(label)
+        return code
+
+    def _grow(self):
+        """Double the capacity of every column"""
+        for name in (
+            "timestamp",
+            "cost",
+            "tokens",
+            "response_time",
+            "provider",
+            "user",
+        ):
+            column = getattr(self, name)
+            grown = np.empty(len(column) * 2, dtype=column.dtype)
+            grown[: self.size] = column[: self.size]
+            setattr(self, name, grown)
+
+    def append(self, call: APICall):
+        """Add a call to the columns"""
+        if self.size == len(self.cost):
+            self._grow()
+
+        i = self.size
+        self.timestamp[i] = np.datetime64(call.timestamp, "us")
+        self.cost[i] = call.cost_usd
+        self.tokens[i] = call.tokens_input + call.tokens_output
+        self.response_time[i] = call.response_time_ms
+        self.provider[i] = self._code(
+            call.provider, self._provider_codes, self.provider_labels
+        )
+        self.user[i] = self._code(call.user_id, self._user_codes, self.user_labels)
+        self.size += 1
+
+    def since(self, cutoff: datetime) -> np.ndarray:
+        """Boolean mask of calls at or after the cutoff"""
+        return self.timestamp[: self.size] >= np.datetime64(cutoff, "us")
+
+    def cost_by(
+        self, codes: np.ndarray, labels: List[str], mask: np.ndarray
+    ) -> Dict[str, float]:
+        """Sum cost per label over the masked calls"""
+        selected = codes[: self.size][mask]
+        counts = np.bincount(selected, minlength=len(labels))
+        sums = np.bincount(
+            selected, weights=self.cost[: self.size][mask], minlength=len(labels)
+        )
+        return {
+            label: float(sums[code])
+            for code, label in enumerate(labels)
+            if counts[code]
+        }
+
+
 class CostTracker:
     """Tracks and optimizes API costs"""
 
+    # Maximum number of calls written to disk per flush
+    FLUSH_BATCH_SIZE = 100
+
     def __init__(self):
         self.calls: List[APICall] = []
-        self.cost_file = Path("./logs/api_costs.json")
+        self.cost_file = Path("./logs/api_costs.jsonl")
+        self.legacy_cost_file = Path("./logs/api_costs.json")
         self.cost_file.parent.mkdir(exist_ok=True)
+        self._cost_fh = None
+        self._write_lock = threading.Lock()
+
+        # Running daily totals and a columnar copy of the history,
+        # both updated on every recorded call; the columns are written slot by
+        # slot and reallocated as they grow, so access goes through the lock
+        self._daily_cost: Dict[date, float] = defaultdict(float)
+        self._columns = _CallColumns()
+        self._totals_lock = threading.Lock()
 
         # Load historical costs
         self._load_costs()
 
+        # Budget thresholds (settings do not change at runtime)
+        self._budget = settings.cost_tracking.daily_budget_usd
+        self._alert_threshold = self._budget * (
+            settings.cost_tracking.alert_threshold_percent / 100
+        )
+        self._downgrade_threshold = self._budget * 0.9
+
+        # Calls are persisted by a background thread so record_call never
+        # waits on disk; anything still queued is written at exit.
+        self._queue: queue.Queue = queue.Queue(maxsize=10000)
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="cost-tracker-flush", daemon=True
+        )
+        self._flusher.start()
+        atexit.register(self._drain)
+
+    def _add_to_totals(self, call: APICall):
+        """Fold a call into the running totals and columns"""
+        with self._totals_lock:
+            self._daily_cost[call.timestamp.date()] += call.cost_usd
+            self._columns.append(call)
+
     def _load_costs(self):
-        """Load historical cost data"""
-        if self.cost_file.exists():
-            try:
-                with open(self.cost_file, "r") as f:
-                    data = json.load(f)
-                    self.calls = [
-                        APICall(
-                            **{
-                                **call,
-                                "timestamp": datetime.fromisoformat(call["timestamp"]),
-                            }
+        """Load historical cost data (one JSON record per line)"""
+        if not self.cost_file.exists() and self.legacy_cost_file.exists():
+            self._migrate_legacy_costs()
+
+        if not self.cost_file.exists():
+            return
+
+        skipped = 0
+        line = ""
+        try:
+            with open(self.cost_file, "r", encoding="utf-8") as f:
+                for lineno, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    # A crash mid-write leaves a torn last line; skip bad
+                    # records rather than losing the rest of the history
+                    try:
+                        call = self._call_from_record(json.loads(line))
+                    except (ValueError, TypeError, KeyError) as e:
+                        skipped += 1
+                        app_logger.warning(
+                            "cost_record_skipped", line=lineno, error=str(e)
                         )
-                        for call in data
-                    ]
-                app_logger.info("cost_history_loaded", records=len(self.calls))
-            except Exception as e:
-                app_logger.error("cost_history_load_failed", error=str(e))
-
-    def _save_costs(self):
-        """Save cost data to file"""
+                        continue
+                    self.calls.append(call)
+                    self._add_to_totals(call)
+
+            # Start new appends on a fresh line after a torn record
+            if line and not line.endswith("\n"):
+                with open(self.cost_file, "a", encoding="utf-8") as f:
+                    f.write("\n")
+
+            app_logger.info(
+                "cost_history_loaded", records=len(self.calls), skipped=skipped
+            )
+        except Exception as e:
+            app_logger.error("cost_history_load_failed", error=str(e))
+
+    def _migrate_legacy_costs(self):
+        """Convert the old whole-file JSON history into the JSON-lines log"""
         try:
-            data = [
-                {**asdict(call), "timestamp": call.timestamp.isoformat()}
-                for call in self.calls
-            ]
-            with open(self.cost_file, "w") as f:
-                json.dump(data, f, indent=2)
+            with open(self.legacy_cost_file, "r") as f:
+                data = json.load(f)
+            with open(self.cost_file, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(call) + "\n" for call in data)
+            app_logger.info("cost_history_migrated", records=len(data))
+        except Exception as e:
+            app_logger.error("cost_history_migration_failed", error=str(e))
+
+    @staticmethod
+    def _call_from_record(record: Dict) -> APICall:
+        """Build an APICall from a stored record"""
+        return APICall(
+            **{**record, "timestamp": datetime.fromisoformat(record["timestamp"])}
+        )
+
+    def _save_costs(self, calls: List[APICall]):
+        """Append a batch of calls to the cost log in a single write"""
+        lines = "".join(
+            json.dumps({**asdict(call), "timestamp": call.timestamp.isoformat()}) + "\n"
+            for call in calls
+        )
+        try:
+            with self._write_lock:
+                if self._cost_fh is None:
+                    self._cost_fh = open(self.cost_file, "a", encoding="utf-8")
+                self._cost_fh.write(lines)
+                self._cost_fh.flush()
         except Exception as e:
             app_logger.error("cost_history_save_failed", error=str(e))
 
+    def _next_batch(self, timeout: Optional[float]) -> List[APICall]:
+        """Pop up to FLUSH_BATCH_SIZE queued calls, waiting up to `timeout` for the first"""
+        try:
+            batch = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+
+        while len(batch) < self.FLUSH_BATCH_SIZE:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _flush_loop(self):
+        """Background writer: persist queued calls in batches"""
+        while True:
+            batch = self._next_batch(timeout=0.5)
+            if batch:
+                self._save_costs(batch)
+
+    def _drain(self):
+        """Write out everything still queued (called at interpreter exit)"""
+        while True:
+            batch = self._next_batch(timeout=0)
+            if not batch:
+                break
+            self._save_costs(batch)
+
     def calculate_cost(
         self, provider: str, model: str, tokens_input: int, tokens_output: int
     ) -> float:
@@ -97,9 +287,10 @@ class CostTracker:
     ):
         """Record an API call"""
         cost = self.calculate_cost(provider, model, tokens_input, tokens_output)
+        now = datetime.now()
 
         call = APICall(
-            timestamp=datetime.now(),
+            timestamp=now,
             provider=provider,
             model=model,
             tokens_input=tokens_input,
@@ -110,7 +301,11 @@ class CostTracker:
         )
 
         self.calls.append(call)
-        self._save_costs()
+        self._add_to_totals(call)
+        try:
+            self._queue.put_nowait(call)
+        except queue.Full:
+            self._save_costs([call])
 
         # Audit log
         audit_logger.log_api_call(
@@ -122,16 +317,13 @@ class CostTracker:
         )
 
         # Check if approaching budget limit
-        daily_cost = self.get_daily_cost()
-        budget = settings.cost_tracking.daily_budget_usd
-        threshold = budget * (settings.cost_tracking.alert_threshold_percent / 100)
-
-        if daily_cost >= threshold:
+        daily_cost = self._daily_cost.get(now.date(), 0.0)
+        if daily_cost >= self._alert_threshold:
             app_logger.warning(
                 "daily_budget_threshold_reached",
                 daily_cost=daily_cost,
-                budget=budget,
-                percent=int((daily_cost / budget) * 100),
+                budget=self._budget,
+                percent=int((daily_cost / self._budget) * 100),
             )
 
     def get_daily_cost(self, date: Optional[datetime] = None) -> float:
@@ -139,62 +331,52 @@ class CostTracker:
         if date is None:
             date = datetime.now()
 
-        start_of_day = datetime(date.year, date.month, date.day)
-        end_of_day = start_of_day + timedelta(days=1)
-
-        return sum(
-            call.cost_usd
-            for call in self.calls
-            if start_of_day <= call.timestamp < end_of_day
-        )
+        return self._daily_cost.get(date.date(), 0.0)
 
     def get_monthly_cost(self, year: int, month: int) -> float:
         """Get total cost for a specific month"""
-        return sum(
-            call.cost_usd
-            for call in self.calls
-            if call.timestamp.year == year and call.timestamp.month == month
-        )
+        with self._totals_lock:
+            return sum(
+                cost
+                for day, cost in self._daily_cost.items()
+                if day.year == year and day.month == month
+            )
 
     def get_cost_by_provider(self, days: int = 30) -> Dict[str, float]:
         """Get cost breakdown by provider"""
-        cutoff = datetime.now() - timedelta(days=days)
-
-        costs = {}
-        for call in self.calls:
-            if call.timestamp >= cutoff:
-                costs[call.provider] = costs.get(call.provider, 0) + call.cost_usd
-
-        return costs
+        columns = self._columns
+        with self._totals_lock:
+            mask = columns.since(datetime.now() - timedelta(days=days))
+            return columns.cost_by(columns.provider, columns.provider_labels, mask)
 
     def get_cost_by_user(self, days: int = 30) -> Dict[str, float]:
         """Get cost breakdown by user"""
-        cutoff = datetime.now() - timedelta(days=days)
-
-        costs = {}
-        for call in self.calls:
-            if call.timestamp >= cutoff:
-                costs[call.user_id] = costs.get(call.user_id, 0) + call.cost_usd
-
-        return costs
+        columns = self._columns
+        with self._totals_lock:
+            mask = columns.since(datetime.now() - timedelta(days=days))
+            return columns.cost_by(columns.user, columns.user_labels, mask)
 
     def should_downgrade_model(self, user_id: str) -> bool:
         """Determine if model should be downgraded to save costs"""
         if not settings.cost_tracking.enable_auto_downgrade:
             return False
 
-        daily_cost = self.get_daily_cost()
-        budget = settings.cost_tracking.daily_budget_usd
-
         # Downgrade if 90% of budget used
-        return daily_cost >= (budget * 0.9)
+        return self._daily_cost.get(date.today(), 0.0) >= self._downgrade_threshold
 
     def get_statistics(self, days: int = 7) -> Dict:
         """Get comprehensive cost statistics"""
-        cutoff = datetime.now() - timedelta(days=days)
-        recent_calls = [call for call in self.calls if call.timestamp >= cutoff]
-
-        if not recent_calls:
+        columns = self._columns
+        with self._totals_lock:
+            mask = columns.since(datetime.now() - timedelta(days=days))
+            total_calls = int(np.count_nonzero(mask))
+            if total_calls:
+                n = columns.size
+                total_cost = float(columns.cost[:n][mask].sum())
+                total_tokens = int(columns.tokens[:n][mask].sum())
+                avg_response_time = float(columns.response_time[:n][mask].mean())
+
+        if not total_calls:
             return {
                 "total_calls": 0,
                 "total_cost": 0,
@@ -203,18 +385,10 @@ class CostTracker:
                 "avg_response_time_ms": 0,
             }
 
-        total_cost = sum(call.cost_usd for call in recent_calls)
-        total_tokens = sum(
-            call.tokens_input + call.tokens_output for call in recent_calls
-        )
-        avg_response_time = sum(call.response_time_ms for call in recent_calls) / len(
-            recent_calls
-        )
-
         return {
-            "total_calls": len(recent_calls),
+            "total_calls": total_calls,
             "total_cost": round(total_cost, 4),
-            "avg_cost_per_call": round(total_cost / len(recent_calls), 4),
+            "avg_cost_per_call": round(total_cost / total_calls, 4),
             "total_tokens": total_tokens,
             "avg_response_time_ms": round(avg_response_time, 2),
             "cost_by_provider": self.get_cost_by_provider(days),
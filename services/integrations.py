@@ -3,20 +3,159 @@ Multi-Channel Alert Integration System
 Supports Slack, Discord, WhatsApp, and Smart Watch notifications
 """
 
+import asyncio
+import atexit
+import functools
+import hashlib
+import queue
+import random
+import threading
+import time
 import requests
-from typing import Optional, Dict, Any
-from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, Any, List, Tuple
 
 from core.config import settings
 from core.logger import app_logger, audit_logger
 
 
+def _pooled_session() -> requests.Session:
+    """Create a session that keeps webhook connections alive between alerts"""
+    session = requests.Session()
+    session.mount(
+        "https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+    )
+    atexit.register(session.close)
+    return session
+
+
+# (message, severity, details) as accepted by send_alert
+Alert = Tuple[str, str, Optional[Dict[str, Any]]]
+
+# Responses worth retrying; any other status is returned to the caller as-is
+_RETRYABLE_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+# Webhook retry policy: connect/read timeout per attempt, retries after the
+# first attempt, and the longest single backoff sleep (Retry-After included)
+_POST_TIMEOUT_S = 5.0
+_POST_MAX_RETRIES = 3
+_BACKOFF_CAP_S = 10.0
+
+# Worst case for one webhook delivery with every retry used (each attempt
+# may spend the timeout connecting and again reading); callers wait this
+# long for a channel before reporting it as failed
+_ATTEMPT_MAX_S = 2 * _POST_TIMEOUT_S
+_SEND_BUDGET_S = (_POST_MAX_RETRIES + 1) * _ATTEMPT_MAX_S + (
+    _POST_MAX_RETRIES * _BACKOFF_CAP_S
+)
+
+
+def _post_with_backoff(
+    session: requests.Session,
+    url: str,
+    payload: Dict[str, Any],
+    max_retries: int = _POST_MAX_RETRIES,
+    base: float = 0.5,
+    cap: float = _BACKOFF_CAP_S,
+) -> requests.Response:
+    """
+    POST JSON, retrying transient failures with capped exponential backoff
+
+    Connection errors, timeouts and retryable status codes are retried up to
+    max_retries times, sleeping base * 2**attempt plus up to 50% jitter (or
+    the server's Retry-After), never more than cap. The last response is
+    returned, or the last exception re-raised, once retries are exhausted.
+    """
+    for attempt in range(max_retries + 1):
+        retry_after = None
+        try:
+            response = session.post(url, json=payload, timeout=_POST_TIMEOUT_S)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if attempt == max_retries:
+                raise
+        else:
+            if response.status_code not in _RETRYABLE_STATUS or attempt == max_retries:
+                return response
+            retry_after = response.headers.get("Retry-After")
+
+        delay = min(cap, base * 2**attempt * (1 + random.random() * 0.5))
+        if retry_after:
+            try:
+                delay = min(cap, float(retry_after))
+            except ValueError:
+                pass
+        time.sleep(delay)
+
+
+class _CircuitBreaker:
+    """Fail fast for a cooldown period after repeated delivery failures"""
+
+    def __init__(self, failure_threshold: int = 5, cooldown_s: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown_s = cooldown_s
+        self._failures = 0
+        self._open_until = 0.0
+
+    def allow(self) -> bool:
+        """False while the breaker is open"""
+        return time.monotonic() >= self._open_until
+
+    def record_success(self):
+        self._failures = 0
+        self._open_until = 0.0
+
+    def record_failure(self):
+        self._failures += 1
+        if self._failures >= self.failure_threshold:
+            self._open_until = time.monotonic() + self.cooldown_s
+
+
+class _Delivery:
+    """Dedup record of one alert, in flight until `done` is set"""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.sent_at = time.monotonic()
+        self.results: Optional[Dict[str, bool]] = None
+        self.done = threading.Event()
+
+
 class SlackIntegration:
     """Send alerts to Slack channels"""
 
+    _USERNAME = "CAN 2025 Guardian"
+    _ICON_EMOJI = ":shield:"
+    _FOOTER = "CAN 2025 Guardian SOC"
+    _COLORS = {"info": "#36a64f", "warning": "#ff9900", "critical": "#ff0000"}
+    _DEFAULT_COLOR = "#cccccc"
+
     def __init__(self):
         self.webhook_url = settings.integrations.slack_webhook_url
         self.channel = settings.integrations.slack_channel
+        self._session = _pooled_session()
+        self._breaker = _CircuitBreaker()
+
+    def close(self):
+        """Close pooled webhook connections"""
+        self._session.close()
+
+    def _attachment(
+        self, message: str, severity: str, details: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Build the Slack attachment for one alert"""
+        return {
+            "color": self._COLORS.get(severity, self._DEFAULT_COLOR),
+            "title": f"🚨 Security Alert - {severity.upper()}",
+            "text": message,
+            "fields": [
+                {"title": k, "value": str(v), "short": True}
+                for k, v in (details or {}).items()
+            ],
+            "footer": self._FOOTER,
+            "ts": int(time.time()),
+        }
 
     def send_alert(
         self,
@@ -35,59 +174,90 @@ class SlackIntegration:
         Returns:
             True if sent successfully
         """
+        return self.send_alerts([(message, severity, details)])
+
+    def send_alerts(self, alerts: List[Alert]) -> bool:
+        """Send several alerts as attachments of a single Slack message"""
         if not self.webhook_url:
             app_logger.warning("slack_webhook_not_configured")
             return False
 
-        # Color coding
-        colors = {"info": "#36a64f", "warning": "#ff9900", "critical": "#ff0000"}
+        if not self._breaker.allow():
+            app_logger.warning("slack_circuit_open", dropped=len(alerts))
+            return False
 
         payload = {
             "channel": self.channel,
-            "username": "CAN 2025 Guardian",
-            "icon_emoji": ":shield:",
-            "attachments": [
-                {
-                    "color": colors.get(severity, "#cccccc"),
-                    "title": f"🚨 Security Alert - {severity.upper()}",
-                    "text": message,
-                    "fields": [
-                        {"title": k, "value": str(v), "short": True}
-                        for k, v in (details or {}).items()
-                    ],
-                    "footer": "CAN 2025 Guardian SOC",
-                    "ts": int(datetime.now().timestamp()),
-                }
-            ],
+            "username": self._USERNAME,
+            "icon_emoji": self._ICON_EMOJI,
+            "attachments": [self._attachment(*alert) for alert in alerts],
         }
 
         try:
-            response = requests.post(self.webhook_url, json=payload, timeout=5)
+            response = _post_with_backoff(self._session, self.webhook_url, payload)
 
             if response.status_code == 200:
-                app_logger.info("slack_alert_sent", severity=severity)
-                audit_logger.log_alert_sent(
-                    alert_type=severity,
-                    channel="slack",
-                    recipient=self.channel,
-                    message=message,
-                    status="sent",
-                )
+                self._breaker.record_success()
+                for message, severity, _ in alerts:
+                    app_logger.info("slack_alert_sent", severity=severity)
+                    audit_logger.log_alert_sent(
+                        alert_type=severity,
+                        channel="slack",
+                        recipient=self.channel,
+                        message=message,
+                        status="sent",
+                    )
                 return True
             else:
                 app_logger.error("slack_alert_failed", status_code=response.status_code)
+                self._breaker.record_failure()
                 return False
 
         except Exception as e:
             app_logger.error("slack_alert_exception", error=str(e))
+            self._breaker.record_failure()
             return False
 
 
 class DiscordIntegration:
     """Send alerts to Discord channels"""
 
+    _USERNAME = "CAN 2025 Guardian"
+    _AVATAR_URL = "https://example.com/shield-icon.png"
+    _FOOTER = {"text": "CAN 2025 Guardian SOC"}
+    _COLORS = {
+        "info": 3447003,  # Blue
+        "warning": 16776960,  # Orange
+        "critical": 15158332,  # Red
+    }
+    _DEFAULT_COLOR = 10070709
+    # Discord accepts at most 10 embeds per message
+    _MAX_EMBEDS = 10
+
     def __init__(self):
         self.webhook_url = settings.integrations.discord_webhook_url
+        self._session = _pooled_session()
+        self._breaker = _CircuitBreaker()
+
+    def close(self):
+        """Close pooled webhook connections"""
+        self._session.close()
+
+    def _embed(
+        self, message: str, severity: str, details: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Build the Discord embed for one alert"""
+        return {
+            "title": f"🚨 Security Alert - {severity.upper()}",
+            "description": message,
+            "color": self._COLORS.get(severity, self._DEFAULT_COLOR),
+            "fields": [
+                {"name": k, "value": str(v), "inline": True}
+                for k, v in (details or {}).items()
+            ],
+            "footer": self._FOOTER,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
 
     def send_alert(
         self,
@@ -96,58 +266,55 @@ class DiscordIntegration:
         details: Optional[Dict[str, Any]] = None,
     ) -> bool:
         """Send alert to Discord"""
+        return self.send_alerts([(message, severity, details)])
+
+    def send_alerts(self, alerts: List[Alert]) -> bool:
+        """Send several alerts as embeds, up to 10 per Discord message"""
         if not self.webhook_url:
             app_logger.warning("discord_webhook_not_configured")
             return False
 
-        # Color coding
-        colors = {
-            "info": 3447003,  # Blue
-            "warning": 16776960,  # Orange
-            "critical": 15158332,  # Red
-        }
-
-        embed = {
-            "title": f"🚨 Security Alert - {severity.upper()}",
-            "description": message,
-            "color": colors.get(severity, 10070709),
-            "fields": [
-                {"name": k, "value": str(v), "inline": True}
-                for k, v in (details or {}).items()
-            ],
-            "footer": {"text": "CAN 2025 Guardian SOC"},
-            "timestamp": datetime.utcnow().isoformat(),
-        }
-
-        payload = {
-            "username": "CAN 2025 Guardian",
-            "avatar_url": "https://example.com/shield-icon.png",
-            "embeds": [embed],
-        }
-
-        try:
-            response = requests.post(self.webhook_url, json=payload, timeout=5)
-
-            if response.status_code in [200, 204]:
-                app_logger.info("discord_alert_sent", severity=severity)
-                audit_logger.log_alert_sent(
-                    alert_type=severity,
-                    channel="discord",
-                    recipient="webhook",
-                    message=message,
-                    status="sent",
-                )
-                return True
-            else:
-                app_logger.error(
-                    "discord_alert_failed", status_code=response.status_code
-                )
-                return False
-
-        except Exception as e:
-            app_logger.error("discord_alert_exception", error=str(e))
+        if not self._breaker.allow():
+            app_logger.warning("discord_circuit_open", dropped=len(alerts))
             return False
 
+        sent = True
+        for start in range(0, len(alerts), self._MAX_EMBEDS):
+            chunk = alerts[start : start + self._MAX_EMBEDS]
+            payload = {
+                "username": self._USERNAME,
+                "avatar_url": self._AVATAR_URL,
+                "embeds": [self._embed(*alert) for alert in chunk],
+            }
+
+            try:
+                response = _post_with_backoff(self._session, self.webhook_url, payload)
+
+                if response.status_code in [200, 204]:
+                    self._breaker.record_success()
+                    for message, severity, _ in chunk:
+                        app_logger.info("discord_alert_sent", severity=severity)
+                        audit_logger.log_alert_sent(
+                            alert_type=severity,
+                            channel="discord",
+                            recipient="webhook",
+                            message=message,
+                            status="sent",
+                        )
+                else:
+                    app_logger.error(
+                        "discord_alert_failed", status_code=response.status_code
+                    )
+                    self._breaker.record_failure()
+                    sent = False
+
+            except Exception as e:
+                app_logger.error("discord_alert_exception", error=str(e))
+                self._breaker.record_failure()
+                sent = False
+
+        return sent
+
 
 class WhatsAppIntegration:
     """Send alerts via WhatsApp Business API"""
@@ -176,17 +343,254 @@ class WhatsAppIntegration:
 class AlertRouter:
     """Routes alerts to appropriate channels"""
 
+    # Queued alerts arriving within this window are sent as one post per channel
+    BATCH_WINDOW_S = 0.2
+    BATCH_MAX_ALERTS = 10
+
     def __init__(self):
         self.slack = SlackIntegration()
         self.discord = DiscordIntegration()
         self.whatsapp = WhatsAppIntegration()
 
+        # Channels are notified in parallel so an alert costs one round trip
+        self._executor = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="alert-channel"
+        )
+
+        # Alerts raised from detection paths are queued and delivered by a
+        # background worker so the caller never waits on a webhook
+        self._queue: queue.Queue = queue.Queue(maxsize=1024)
+        self._worker = threading.Thread(
+            target=self._drain, name="alert-router", daemon=True
+        )
+        self._worker.start()
+        atexit.register(self.flush, 5.0)
+
+        # Repeats of an alert that is in flight, or was delivered within the
+        # TTL, are suppressed; undelivered alerts are forgotten straight away
+        self._dedup: Dict[str, _Delivery] = {}
+        self._dedup_ttl = 30.0
+        self._dedup_lock = threading.Lock()
+
+    def _recent_alert(
+        self,
+        severity: str,
+        message: str,
+        channels: List[str],
+        dedup_key: Optional[str],
+        force: bool,
+    ) -> Tuple[_Delivery, bool]:
+        """
+        Check whether an identical alert is in flight or went out within the TTL
+
+        Returns (existing delivery, True) for a duplicate; otherwise records
+        this alert as in flight and returns (its delivery, False).
+        """
+        # The channel set is part of the identity: the same alert sent to
+        # other channels is a new delivery, not a repeat
+        identity = dedup_key or f"{severity}:{message}"
+        source = f"{identity}|{','.join(sorted(channels))}"
+        key = hashlib.blake2b(source.encode("utf-8"), digest_size=16).hexdigest()
+        now = time.monotonic()
+
+        with self._dedup_lock:
+            entry = self._dedup.get(key)
+            if (
+                not force
+                and entry
+                and (not entry.done.is_set() or now - entry.sent_at < self._dedup_ttl)
+            ):
+                return entry, True
+
+            delivery = _Delivery(key)
+            self._dedup[key] = delivery
+            if len(self._dedup) > 1024:
+                self._dedup = {
+                    k: v
+                    for k, v in self._dedup.items()
+                    if not v.done.is_set() or now - v.sent_at < self._dedup_ttl
+                }
+        return delivery, False
+
+    def _finish_alert(self, delivery: _Delivery, results: Dict[str, bool]):
+        """
+        Record how an alert was delivered
+
+        An alert that reached at least one channel suppresses repeats for the
+        TTL from now; one that reached none is forgotten so it can be retried.
+        """
+        with self._dedup_lock:
+            delivery.results = results
+            if any(results.values()):
+                delivery.sent_at = time.monotonic()
+            elif self._dedup.get(delivery.key) is delivery:
+                del self._dedup[delivery.key]
+        delivery.done.set()
+
+    def _submit(self, fn, *args) -> Future:
+        """
+        Run a channel send on the executor, or inline once it has shut down
+
+        concurrent.futures stops its executors before atexit handlers run,
+        so the exit-time flush has to deliver on the worker thread itself.
+        """
+        try:
+            return self._executor.submit(fn, *args)
+        except RuntimeError:
+            future: Future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+    def _collect(self, futures: Dict[str, Future]) -> Dict[str, bool]:
+        """
+        Wait for per-channel sends for up to the webhook retry budget
+
+        A send still running after that is reported as failed; its eventual
+        outcome is logged rather than dropped.
+        """
+        deadline = time.monotonic() + _SEND_BUDGET_S
+        results = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result(
+                    timeout=max(0.0, deadline - time.monotonic())
+                )
+            except FutureTimeoutError:
+                app_logger.error(
+                    "channel_alert_timeout", channel=name, timeout_s=_SEND_BUDGET_S
+                )
+                if not future.cancel():
+                    future.add_done_callback(
+                        functools.partial(self._log_late_send, name)
+                    )
+                results[name] = False
+            except Exception as e:
+                app_logger.error("channel_alert_failed", channel=name, error=str(e))
+                results[name] = False
+        return results
+
+    @staticmethod
+    def _log_late_send(name: str, future: Future):
+        """Record the outcome of a send that finished after its caller gave up"""
+        error = future.exception()
+        app_logger.warning(
+            "channel_alert_late",
+            channel=name,
+            sent=error is None and bool(future.result()),
+            error=str(error) if error else None,
+        )
+
+    def _next_batch(self) -> list:
+        """Block for one queued alert, then collect more for up to BATCH_WINDOW_S"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.BATCH_WINDOW_S
+        while len(batch) < self.BATCH_MAX_ALERTS:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _drain(self):
+        """Background worker: deliver queued alerts"""
+        while True:
+            batch = self._next_batch()
+            try:
+                self._deliver_batch(batch)
+            except Exception as e:
+                app_logger.error("queued_alert_failed", error=str(e))
+                for *_, delivery in batch:
+                    if not delivery.done.is_set():
+                        self._finish_alert(delivery, {})
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _deliver_batch(self, batch: list):
+        """Send a batch of queued alerts with a single post per channel"""
+        integrations = {"slack": self.slack, "discord": self.discord}
+        per_channel: Dict[str, List[Alert]] = {name: [] for name in integrations}
+        for message, severity, details, channels, _ in batch:
+            for name in integrations:
+                if name in channels:
+                    per_channel[name].append((message, severity, details))
+
+        futures = {
+            name: self._submit(integrations[name].send_alerts, alerts)
+            for name, alerts in per_channel.items()
+            if alerts
+        }
+
+        results = self._collect(futures)
+
+        # Duplicates were filtered when the alerts were queued; record how
+        # each one was delivered
+        for _, _, _, channels, delivery in batch:
+            self._finish_alert(
+                delivery,
+                {name: ok for name, ok in results.items() if name in channels},
+            )
+
+        app_logger.info("alert_batch_sent", alerts=len(batch), results=results)
+
+    def enqueue_alert(
+        self,
+        message: str,
+        severity: str = "warning",
+        details: Optional[Dict[str, Any]] = None,
+        channels: list = ["slack", "discord"],
+        dedup_key: Optional[str] = None,
+        force: bool = False,
+    ) -> bool:
+        """
+        Queue an alert for background delivery and return immediately
+
+        Returns:
+            False if the alert was suppressed as a duplicate or the queue is full
+        """
+        delivery, duplicate = self._recent_alert(
+            severity, message, channels, dedup_key, force
+        )
+        if duplicate:
+            app_logger.info("alert_suppressed", severity=severity)
+            return False
+
+        try:
+            self._queue.put_nowait((message, severity, details, channels, delivery))
+            return True
+        except queue.Full:
+            app_logger.warning("alert_queue_full", severity=severity)
+            self._finish_alert(delivery, {})
+            return False
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued alert has been delivered (True if drained)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                if deadline is None:
+                    self._queue.all_tasks_done.wait()
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
     def send_multi_channel_alert(
         self,
         message: str,
         severity: str = "warning",
         details: Optional[Dict[str, Any]] = None,
         channels: list = ["slack", "discord"],
+        dedup_key: Optional[str] = None,
+        force: bool = False,
     ):
         """
         Send alert to multiple channels
@@ -196,29 +600,70 @@ class AlertRouter:
             severity: info, warning, critical
             details: Additional context
             channels: List of channels to notify
+            dedup_key: Identity used to suppress repeats (defaults to the message)
+            force: Send even if an identical alert went out recently
         """
+        delivery, duplicate = self._recent_alert(
+            severity, message, channels, dedup_key, force
+        )
+        if duplicate:
+            # Report the outcome of the identical send instead of repeating it,
+            # waiting for it if it is still in flight
+            delivery.done.wait(_SEND_BUDGET_S)
+            app_logger.info("alert_suppressed", severity=severity)
+            results = delivery.results or {}
+            return {name: results.get(name, False) for name in channels}
+
         results = {}
+        futures = {}
 
         if "slack" in channels:
-            results["slack"] = self.slack.send_alert(message, severity, details)
+            futures["slack"] = self._submit(
+                self.slack.send_alert, message, severity, details
+            )
 
         if "discord" in channels:
-            results["discord"] = self.discord.send_alert(message, severity, details)
+            futures["discord"] = self._submit(
+                self.discord.send_alert, message, severity, details
+            )
 
         if "whatsapp" in channels:
             results["whatsapp"] = False  # Placeholder
 
+        results.update(self._collect(futures))
+        self._finish_alert(delivery, results)
+
         app_logger.info("multi_channel_alert_sent", results=results)
         return results
 
-    def send_threat_detected_alert(
+    async def send_multi_channel_alert_async(
         self,
+        message: str,
+        severity: str = "warning",
+        details: Optional[Dict[str, Any]] = None,
+        channels: list = ["slack", "discord"],
+        dedup_key: Optional[str] = None,
+        force: bool = False,
+    ) -> Dict[str, bool]:
+        """send_multi_channel_alert for async callers, without blocking the event loop"""
+        return await asyncio.to_thread(
+            self.send_multi_channel_alert,
+            message,
+            severity,
+            details,
+            channels,
+            dedup_key,
+            force,
+        )
+
+    @staticmethod
+    def _threat_alert(
         threat_type: str,
         location: str,
         confidence: float,
         image_path: Optional[str] = None,
-    ):
-        """Send threat detection alert"""
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build the message and details of a threat alert"""
         message = (
             f"⚠️ **Threat Detected**\n\n"
             f"Type: {threat_type}\n"
@@ -230,14 +675,94 @@ class AlertRouter:
             "Threat Type": threat_type,
             "Location": location,
             "Confidence": f"{confidence:.1%}",
-            "Time": datetime.now().strftime("%H:%M:%S"),
+            "Time": time.strftime("%H:%M:%S"),
         }
 
         if image_path:
             details["Evidence"] = image_path
 
-        self.send_multi_channel_alert(
-            message=message, severity="critical", details=details
+        return message, details
+
+    def send_threat_detected_alert(
+        self,
+        threat_type: str,
+        location: str,
+        confidence: float,
+        image_path: Optional[str] = None,
+    ):
+        """Send threat detection alert"""
+        message, details = self._threat_alert(
+            threat_type, location, confidence, image_path
+        )
+
+        self.enqueue_alert(
+            message=message,
+            severity="critical",
+            details=details,
+            dedup_key=f"threat:{threat_type}:{location}",
+        )
+
+    def send_threat_detected_alert_with_fallback(
+        self,
+        threat_type: str,
+        location: str,
+        confidence: float,
+        image_path: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Send threat alert to the first channel that accepts it (Slack, then Discord)
+
+        Unlike send_threat_detected_alert this does not broadcast: a channel
+        is only tried if the previous one failed or its circuit is open.
+
+        Blocks until a channel accepts the alert or all have failed, which
+        with webhook retries can take over a minute; call it from a worker
+        thread, or use send_threat_detected_alert_with_fallback_async.
+
+        Returns:
+            Name of the channel that delivered the alert, or None if it was
+            suppressed as a duplicate or every channel failed
+        """
+        message, details = self._threat_alert(
+            threat_type, location, confidence, image_path
+        )
+
+        delivery, duplicate = self._recent_alert(
+            "critical",
+            message,
+            ["slack", "discord"],
+            f"threat:{threat_type}:{location}",
+            False,
+        )
+        if duplicate:
+            app_logger.info("alert_suppressed", severity="critical")
+            return None
+
+        for name, integration in (("slack", self.slack), ("discord", self.discord)):
+            if integration.send_alert(message, "critical", details):
+                self._finish_alert(delivery, {name: True})
+                return name
+
+        # Nothing was delivered: forget the alert so a retry is not suppressed
+        self._finish_alert(delivery, {})
+
+        app_logger.error("threat_alert_fallback_exhausted", location=location)
+        return None
+
+    async def send_threat_detected_alert_with_fallback_async(
+        self,
+        threat_type: str,
+        location: str,
+        confidence: float,
+        image_path: Optional[str] = None,
+    ) -> Optional[str]:
+        """send_threat_detected_alert_with_fallback without blocking the event loop"""
+        return await asyncio.to_thread(
+            self.send_threat_detected_alert_with_fallback,
+            threat_type,
+            location,
+            confidence,
+            image_path,
         )
 
     def send_crowd_density_alert(self, location: str, count: int, capacity: int):
@@ -260,8 +785,12 @@ class AlertRouter:
 
         severity = "critical" if density_percent > 90 else "warning"
 
-        self.send_multi_channel_alert(
-            message=message, severity=severity, details=details
+        # Keyed on severity too, so an escalation to critical is not suppressed
+        self.enqueue_alert(
+            message=message,
+            severity=severity,
+            details=details,
+            dedup_key=f"crowd:{location}:{severity}",
         )
 
 
@@ -7,16 +7,40 @@ import cv2
 import numpy as np
 from typing import Optional, List, Tuple, Dict
 from threading import Thread
-from queue import Queue
+from collections import deque
 import time
 
 from core.config import settings
 from core.logger import app_logger, perf_logger
 
 
+def _cuda_decode_available(source) -> bool:
+    """True if an RTSP source can be decoded on an NVIDIA GPU (cv2.cudacodec)"""
+    if not isinstance(source, str) or not source.lower().startswith("rtsp://"):
+        return False
+    if not hasattr(cv2, "cudacodec"):
+        return False
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except cv2.error:
+        return False
+
+
 class VideoStream:
     """Process live video streams from RTSP/RTMP sources"""
 
+    # Pause after a failed read so a dead feed does not spin and starve the
+    # capture threads of the other cameras
+    READ_RETRY_DELAY_S = 0.1
+
+    # Some RTSP servers report the 90 kHz clock rate as CAP_PROP_FPS; rates
+    # above this are treated as unknown
+    MAX_PLAUSIBLE_FPS = 240
+
+    # Live feeds deliver frames at camera rate; anything else (files, other
+    # URLs) is read as fast as it decodes and has to be paced
+    LIVE_SCHEMES = ("rtsp://", "rtsps://", "rtmp://", "udp://", "tcp://")
+
     def __init__(self, source: str, stream_id: str, buffer_size: int = 30):
         """
         Initialize video stream
@@ -31,12 +55,16 @@ class VideoStream:
         self.buffer_size = buffer_size
 
         self.stream = None
-        self.frame_queue = Queue(maxsize=buffer_size)
+        self._gpu_reader = None
+        # Ring buffer: appending to a full deque silently drops the oldest frame
+        self.frame_buf: deque = deque(maxlen=buffer_size)
         self.stopped = False
         self.thread = None
 
         self.fps = 0
         self.frame_count = 0
+        self._skip = 1
+        self._frame_interval = 0.0
         self.width = 0
         self.height = 0
 
@@ -45,16 +73,43 @@ class VideoStream:
     def start(self) -> bool:
         """Start capturing from video stream"""
         try:
-            self.stream = cv2.VideoCapture(self.source)
-
-            if not self.stream.isOpened():
-                app_logger.error("stream_open_failed", stream_id=self.stream_id)
-                return False
-
-            # Get stream properties
-            self.fps = self.stream.get(cv2.CAP_PROP_FPS)
-            self.width = int(self.stream.get(cv2.CAP_PROP_FRAME_WIDTH))
-            self.height = int(self.stream.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            if _cuda_decode_available(self.source):
+                # Decode on the GPU (NVDEC); frames are downloaded once decoded
+                self._gpu_reader = cv2.cudacodec.createVideoReader(self.source)
+                fmt = self._gpu_reader.format()
+                self.fps = getattr(fmt, "fps", 0)
+                self.width = fmt.width
+                self.height = fmt.height
+            else:
+                if isinstance(self.source, str):
+                    self.stream = cv2.VideoCapture(self.source, cv2.CAP_FFMPEG)
+                else:
+                    self.stream = cv2.VideoCapture(self.source)
+
+                if not self.stream.isOpened():
+                    app_logger.error("stream_open_failed", stream_id=self.stream_id)
+                    return False
+
+                # Get stream properties
+                self.fps = self.stream.get(cv2.CAP_PROP_FPS)
+                self.width = int(self.stream.get(cv2.CAP_PROP_FRAME_WIDTH))
+                self.height = int(self.stream.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+                # Keep the decoder from queueing stale frames
+                self.stream.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+            # Only keep one frame in every `_skip` to match the processing rate
+            processing_fps = settings.video_stream.processing_fps
+            fps_known = 0 < self.fps <= self.MAX_PLAUSIBLE_FPS
+            if processing_fps > 0 and fps_known:
+                self._skip = max(1, int(self.fps / processing_fps))
+
+            # Pace non-live sources to the rate the kept frames represent
+            if not self._is_live():
+                if fps_known:
+                    self._frame_interval = self._skip / self.fps
+                elif processing_fps > 0:
+                    self._frame_interval = 1.0 / processing_fps
 
             # Start capture thread
             self.stopped = False
@@ -66,6 +121,7 @@ class VideoStream:
                 stream_id=self.stream_id,
                 fps=self.fps,
                 resolution=f"{self.width}x{self.height}",
+                gpu_decode=self._gpu_reader is not None,
             )
 
             return True
@@ -76,47 +132,80 @@ class VideoStream:
             )
             return False
 
+    def _is_live(self) -> bool:
+        """True for camera indices and streaming protocols"""
+        if not isinstance(self.source, str) or self.source.isdigit():
+            return True
+        return self.source.lower().startswith(self.LIVE_SCHEMES)
+
+    def _read_gpu_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Decode the next kept frame on the GPU and download it as BGR"""
+        for _ in range(self._skip - 1):
+            self._gpu_reader.grab()
+        ret, gpu_frame = self._gpu_reader.nextFrame()
+        if not ret:
+            return False, None
+
+        frame = gpu_frame.download()
+        if frame.ndim == 3 and frame.shape[2] == 4:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
+        return True, frame
+
     def _capture_frames(self):
         """Capture frames in background thread"""
+        next_due = time.monotonic()
         while not self.stopped:
-            if not self.stream.isOpened():
-                break
-
-            ret, frame = self.stream.read()
+            if self._gpu_reader is not None:
+                ret, frame = self._read_gpu_frame()
+            else:
+                if not self.stream.isOpened():
+                    break
+
+                # With FFmpeg, grab() still decodes each skipped frame; skipping
+                # retrieve() saves the colour conversion and copy for them
+                for _ in range(self._skip - 1):
+                    self.stream.grab()
+                ret, frame = False, None
+                if self.stream.grab():
+                    ret, frame = self.stream.retrieve()
 
             if not ret:
                 app_logger.warning("frame_read_failed", stream_id=self.stream_id)
+                time.sleep(self.READ_RETRY_DELAY_S)
                 continue
 
-            # Add to queue (drop oldest if full)
-            if self.frame_queue.full():
-                try:
-                    self.frame_queue.get_nowait()
-                except:
-                    pass
-
-            self.frame_queue.put(frame)
+            self.frame_buf.append(frame)
             self.frame_count += 1
 
-            # Sleep to match target FPS
-            if settings.video_stream.processing_fps > 0:
-                time.sleep(1.0 / settings.video_stream.processing_fps)
+            if self._frame_interval:
+                next_due += self._frame_interval
+                delay = next_due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_due = time.monotonic()  # fell behind; don't burst
 
     def read(self) -> Optional[np.ndarray]:
         """
         Read next frame from stream
 
+        The capture thread never touches a frame again after buffering it
+        (every retrieve/download allocates a new array), so the caller owns
+        the returned array and does not need to copy it.
+
         Returns:
             Frame as numpy array or None if not available
         """
-        if self.frame_queue.empty():
-            return None
-
         try:
-            return self.frame_queue.get_nowait()
-        except:
+            return self.frame_buf.popleft()
+        except IndexError:
             return None
 
+    @property
+    def buffer_depth(self) -> int:
+        """Number of frames currently buffered"""
+        return len(self.frame_buf)
+
     def stop(self):
         """Stop capturing from stream"""
         self.stopped = True
@@ -127,6 +216,8 @@ class VideoStream:
         if self.stream is not None:
             self.stream.release()
 
+        self._gpu_reader = None
+
         app_logger.info(
             "video_stream_stopped",
             stream_id=self.stream_id,
@@ -140,7 +231,7 @@ class VideoStream:
             "fps": self.fps,
             "resolution": f"{self.width}x{self.height}",
             "frames_processed": self.frame_count,
-            "buffer_size": self.frame_queue.qsize(),
+            "buffer_size": self.buffer_depth,
             "is_active": not self.stopped,
         }
 
@@ -208,13 +299,11 @@ class MultiCameraManager:
 
     def get_all_frames(self) -> Dict[str, np.ndarray]:
         """Get latest frame from all active streams"""
-        frames = {}
-        for stream_id, stream in self.streams.items():
-            frame = stream.read()
-            if frame is not None:
-                frames[stream_id] = frame
-
-        return frames
+        return {
+            stream_id: frame
+            for stream_id, stream in self.streams.items()
+            if (frame := stream.read()) is not None
+        }
 
     def stop_all(self):
         """Stop all video streams"""
@@ -228,6 +317,21 @@ class MultiCameraManager:
         return [stream.get_stats() for stream in self.streams.values()]
 
 
+# Composite buffers reused across calls, keyed by (rows, cols, cell_h, cell_w);
+# only the most recently used layouts are kept
+_grid_buffers: Dict[Tuple[int, int, int, int], np.ndarray] = {}
+_GRID_BUFFER_LIMIT = 2
+
+
+def _as_bgr(frame: np.ndarray) -> np.ndarray:
+    """Convert grayscale or BGRA frames to 3-channel BGR"""
+    if frame.ndim == 2:
+        return cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+    if frame.shape[2] == 4:
+        return cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
+    return frame
+
+
 def create_multi_view(
     frames: Dict[str, np.ndarray], grid_size: Tuple[int, int] = (2, 2)
 ) -> np.ndarray:
@@ -239,7 +343,8 @@ def create_multi_view(
         grid_size: (rows, cols) for grid layout
 
     Returns:
-        Combined grid image
+        Combined grid image (the buffer is reused by the next call with the
+        same layout, so copy it if it must outlive that call)
     """
     rows, cols = grid_size
 
@@ -254,24 +359,38 @@ def create_multi_view(
     cell_height = cell_height // rows
     cell_width = cell_width // cols
 
-    # Create blank grid
-    grid = np.zeros((cell_height * rows, cell_width * cols, 3), dtype=np.uint8)
+    key = (rows, cols, cell_height, cell_width)
+    grid = _grid_buffers.pop(key, None)
+    if grid is None:
+        grid = np.zeros((cell_height * rows, cell_width * cols, 3), dtype=np.uint8)
+        while len(_grid_buffers) >= _GRID_BUFFER_LIMIT:
+            _grid_buffers.pop(next(iter(_grid_buffers)))
+    _grid_buffers[key] = grid
 
-    # Fill grid with frames
+    # Fill grid with frames, resizing each one straight into its cell
     stream_ids = list(frames.keys())
-    for idx in range(min(len(frames), rows * cols)):
+    filled = min(len(frames), rows * cols)
+    for idx in range(rows * cols):
         row = idx // cols
         col = idx % cols
 
-        frame = frames[stream_ids[idx]]
-        resized = cv2.resize(frame, (cell_width, cell_height))
-
         y_start = row * cell_height
         y_end = (row + 1) * cell_height
         x_start = col * cell_width
         x_end = (col + 1) * cell_width
 
-        grid[y_start:y_end, x_start:x_end] = resized
+        cell = grid[y_start:y_end, x_start:x_end]
+        if idx >= filled:
+            cell[:] = 0
+            continue
+
+        # OpenCV only writes into `cell` when the result is BGR uint8;
+        # anything else comes back as a new array and is copied in
+        resized = cv2.resize(
+            _as_bgr(frames[stream_ids[idx]]), (cell_width, cell_height), dst=cell
+        )
+        if resized is not cell:
+            cell[:] = resized
 
         # Add stream ID label
         cv2.putText(